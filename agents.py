@@ -1,10 +1,6 @@
-from openai import OpenAI
-
-from config import settings
+from router import router
 from state import ConversationState
 
-_client = None
-
 AGENTS = {
     "Bob": {
         "voice": "echo",
@@ -41,20 +37,9 @@ Always recommend consulting licensed professionals for structural, electrical, o
 }
 
 
-def _get_client() -> OpenAI:
-    global _client
-    if _client is None:
-        _client = OpenAI(
-            api_key=settings.openrouter_api_key,
-            base_url=settings.openrouter_base_url,
-        )
-    return _client
-
-
 def respond(state: ConversationState) -> str:
     """Generate a response from the active agent given conversation state."""
     agent_cfg = AGENTS[state.active_agent]
-    client = _get_client()
 
     system = agent_cfg["system_prompt"]
 
@@ -64,16 +49,9 @@ def respond(state: ConversationState) -> str:
         system += f"\n\nPrevious handoff notes (use this context to continue the conversation seamlessly):\n{handoff_ctx}"
 
     messages = [{"role": "system", "content": system}]
-    messages.extend(state.history)
-
-    resp = client.chat.completions.create(
-        model=settings.llm_model,
-        messages=messages,
-        max_tokens=300,
-        temperature=0.7,
-    )
+    messages.extend(state.messages())
 
-    return resp.choices[0].message.content.strip()
+    return router.complete("respond", messages, agent=state.active_agent)
 
 
 def get_voice(agent_name: str) -> str:
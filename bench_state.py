@@ -0,0 +1,65 @@
+"""Memory benchmark -bytes per session at 10, 100 and 1000 turns.
+
+Compares the old list-of-dicts history with the packed ConversationState,
+warm and compressed. Run: python3 bench_state.py"""
+
+import random
+import tracemalloc
+
+from state import ConversationState
+
+SESSIONS = 50
+TURNS = (10, 100, 1000)
+
+_WORDS = (
+    "kitchen cabinets countertops budget permit wall load-bearing contractor "
+    "quote timeline plumbing electrical inspection quartz granite tile demo "
+    "drywall framing beam estimate schedule weeks install order measure"
+).split()
+
+
+def _utterance(rng: random.Random) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(12, 40))).capitalize() + "."
+
+
+def _build_legacy(turns: int, rng: random.Random) -> list[dict[str, str]]:
+    history = []
+    for _ in range(turns):
+        history.append({"role": "user", "content": _utterance(rng)})
+        history.append({"role": "assistant", "content": _utterance(rng)})
+    return history
+
+
+def _build_packed(turns: int, rng: random.Random, compress: bool) -> ConversationState:
+    state = ConversationState()
+    for _ in range(turns):
+        state.add_message("user", _utterance(rng))
+        state.add_message("assistant", _utterance(rng))
+    if compress:
+        state.compress()
+    return state
+
+
+def _bytes_per_session(build) -> int:
+    # Same seed for every variant so all of them hold identical text
+    rng = random.Random(0)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    sessions = [build(rng) for _ in range(SESSIONS)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del sessions
+    return (after - before) // SESSIONS
+
+
+def main():
+    print(f"{'turns':>6} {'legacy':>12} {'packed':>12} {'compressed':>12}")
+    for turns in TURNS:
+        legacy = _bytes_per_session(lambda rng: _build_legacy(turns, rng))
+        packed = _bytes_per_session(lambda rng: _build_packed(turns, rng, False))
+        compressed = _bytes_per_session(lambda rng: _build_packed(turns, rng, True))
+        print(f"{turns:>6} {legacy:>12,} {packed:>12,} {compressed:>12,}")
+
+
+if __name__ == "__main__":
+    main()
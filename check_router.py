@@ -0,0 +1,110 @@
+"""Router check against local stub endpoints of differing speeds.
+
+Serves an OpenAI-compatible SSE stream in-process for three models and
+asserts the primary -> fallback -> probe sequence and the EWMA updates.
+Run: python3 check_router.py"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import time
+
+from openai import OpenAI
+
+from config import settings
+from router import EWMA_ALPHA, PROBE_EVERY, RouteDecision, Router
+
+# model -> (TTFT seconds, chunks, tokens per chunk, seconds between chunks)
+STUB_MODELS = {
+    "slow": (0.5, 100, 1, 0.02),  # ~2.5s: misses Bob's 2000ms SLO
+    "medium": (0.2, 40, 1, 0.02),  # ~1.0s: short answers, meets it
+    "fast": (0.02, 25, 4, 0.002),  # batches 4 tokens per chunk, reports usage
+}
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _send(self, payload: dict) -> None:
+        self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode())
+        self.wfile.flush()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        model = body["model"]
+        ttft, chunks, per_chunk, gap = STUB_MODELS[model]
+        base = {"id": "stub", "object": "chat.completion.chunk", "created": 0, "model": model}
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        time.sleep(ttft)
+        for i in range(chunks):
+            content = "tok " * per_chunk
+            self._send({**base, "choices": [{"index": 0, "delta": {"content": content}, "finish_reason": None}]})
+            time.sleep(gap)
+        # Only the fast model reports usage, so the others exercise chunk counting
+        if per_chunk > 1 and body.get("stream_options", {}).get("include_usage"):
+            tokens = chunks * per_chunk
+            self._send({**base, "choices": [], "usage": {
+                "prompt_tokens": 1, "completion_tokens": tokens, "total_tokens": tokens + 1,
+            }})
+        self.wfile.write(b"data: [DONE]\n\n")
+
+
+def _router(port: int) -> Router:
+    return Router(_client=OpenAI(api_key="stub", base_url=f"http://127.0.0.1:{port}/v1"))
+
+
+def _run(router: Router, messages: list[dict[str, str]], calls: int) -> list[RouteDecision]:
+    decisions = []
+    for _ in range(calls):
+        router.complete("respond", messages, agent="Bob")
+        decisions.append(router.last)
+    return decisions
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    messages = [{"role": "user", "content": "hi"}]
+    settings.llm_routes = {}
+    settings.llm_fast_model = "fast"
+
+    # Slow primary: tried once cold, then fallback until the probe comes round
+    settings.llm_model = "slow"
+    router = _router(port)
+    decisions = _run(router, messages, PROBE_EVERY + 2)
+    reasons = [d.reason for d in decisions]
+    assert reasons == ["primary"] + ["fallback"] * (PROBE_EVERY - 1) + ["probe", "fallback"], reasons
+    assert decisions[1].predicted_ms > 2000, decisions[1]
+    assert router.outcomes == {("slow", "primary"): 1, ("slow", "probe"): 1, ("fast", "fallback"): PROBE_EVERY}
+
+    slow = router.stats["slow"]
+    first_ttft = decisions[0].ttft_ms
+    probe_ttft = decisions[PROBE_EVERY].ttft_ms
+    assert slow.calls == 2
+    assert abs(slow.ttft_ms - (first_ttft + EWMA_ALPHA * (probe_ttft - first_ttft))) < 1e-6
+    assert router.lengths[("respond:Bob", "slow")] == 100
+
+    # Usage beats chunk counting: 25 chunks but 100 tokens
+    fast = router.stats["fast"]
+    assert router.lengths[("respond:Bob", "fast")] == 100
+    assert fast.tokens_per_s > 25 / 0.05, fast
+
+    # A primary that is slow per token but answers briefly stays on primary
+    settings.llm_model = "medium"
+    router = _router(port)
+    decisions = _run(router, messages, 3)
+    assert [d.reason for d in decisions] == ["primary"] * 3
+    assert 0 < decisions[-1].predicted_ms < 2000, decisions[-1]
+    assert "fast" not in router.stats
+
+    server.shutdown()
+    print("router check passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Session round-trip check: compress -> spill -> reload.
+
+Run: python3 check_state.py"""
+
+import json
+import os
+import tempfile
+
+from config import settings
+from state import ConversationState, HandoffNote, SessionStore
+
+
+def main():
+    with tempfile.TemporaryDirectory() as spill_dir:
+        store = SessionStore(spill_dir)
+        state = store.get("kitchen-42")
+        state.add_message("user", "Hi Bob, kitchen remodel, budget ~$25k — new cabinets ✓")
+        state.add_message("assistant", "Great! Is the wall you want to open load-bearing?")
+        state.add_message("system", "You are now taking over from Bob.")
+        state.handoff_notes.append(HandoffNote(
+            "Bob", "Alice", "Kitchen remodel, $25k", key_facts=["budget: $25k"], open_questions=None,
+        ))
+        state.active_agent = "Alice"
+        messages = state.messages()
+        notes = list(state.handoff_notes)
+
+        # Past the compress threshold only: stays in memory, compressed
+        # +1s margin: (t + threshold) - t can land just under threshold in floats
+        store.sweep(now=state.last_used + settings.session_compress_after + 1)
+        assert state.is_compressed and "kitchen-42" in store and len(store) == 1
+
+        # Past the spill threshold: written to disk, dropped from memory
+        store.sweep(now=state.last_used + settings.session_spill_after + 1)
+        assert len(store) == 0 and os.path.exists(os.path.join(spill_dir, "kitchen-42.json"))
+        try:
+            state.add_message("user", "still there?")
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("append to a spilled state should fail")
+
+        reloaded = store.get("kitchen-42")
+        assert reloaded is not state
+        assert reloaded.messages() == messages
+        assert reloaded.handoff_notes == notes
+        assert reloaded.active_agent == "Alice"
+        assert reloaded.message_count == 3 and reloaded.count("user") == 1
+        assert not os.listdir(spill_dir)
+
+        # A failed write keeps the session in memory and leaves no file behind
+        def _disk_full(src, dst):
+            raise OSError("disk full")
+
+        real_replace, os.replace = os.replace, _disk_full
+        try:
+            store.sweep(now=reloaded.last_used + settings.session_spill_after + 1)
+        except OSError:
+            pass
+        else:
+            raise AssertionError("spill should have failed")
+        finally:
+            os.replace = real_replace
+        assert store.get("kitchen-42") is reloaded and not reloaded.spilled
+        assert not os.listdir(spill_dir)
+
+        # Offsets are stored as plain ints, and a bad one is rejected on load
+        spilled = json.loads(reloaded.to_json())
+        assert spilled["ends"] == reloaded._ends.tolist()
+        spilled["ends"][-1] += 1
+        try:
+            ConversationState.from_json(json.dumps(spilled))
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("mismatched final offset should be rejected")
+
+        # A held reference that keeps being used isn't swept out from under its caller
+        reloaded.add_message("user", "What permits do I need?")
+        store.sweep(now=reloaded.last_used + settings.session_compress_after / 2)
+        assert len(store) == 1
+
+        for bad in ("../evil", "a/b", "", "x" * 200):
+            assert bad not in store
+            try:
+                store.get(bad)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError(f"session id {bad!r} should be rejected")
+
+    print("state check passed")
+
+
+if __name__ == "__main__":
+    main()
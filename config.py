@@ -16,6 +16,16 @@ class Settings(BaseSettings):
     # LLM
     openrouter_base_url: str = "https://openrouter.ai/api/v1"
     llm_model: str = "openai/gpt-4o-mini"
+    # Per-call overrides keyed "respond", "respond:Alice", "handoff", "summary"
+    # e.g. LLM_ROUTES='{"respond:Alice": "openai/gpt-4o"}'
+    llm_routes: dict[str, str] = {}
+    # Faster model used when the routed one would miss its latency SLO ("" = never fall back)
+    llm_fast_model: str = ""
+
+    # Session memory: compress idle sessions, then spill them to disk (seconds)
+    session_compress_after: int = 300
+    session_spill_after: int = 1800
+    session_spill_dir: str = ".sessions"
 
     # Audio
     sample_rate: int = 16000
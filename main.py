@@ -3,6 +3,7 @@
 import time
 
 from agents import get_voice, respond
+from router import router
 from stt import transcribe
 from state import ConversationState
 from transfer import detect_agent_suggestion, detect_transfer, generate_handoff_note
@@ -29,12 +30,19 @@ def timed(label, fn, *args, **kwargs):
     return result
 
 
+def print_route() -> None:
+    """Print which model the router picked for the last LLM call, and why."""
+    if router.last:
+        print(f"     🧭 Route: {router.last.format()}")
+
+
 def handle_transfer(state: ConversationState, target: str) -> str:
     """Execute a transfer: generate handoff note, switch agent, return greeting."""
     old_agent = state.active_agent
     print(f"\n  📋 Generating handoff note from {old_agent}...")
 
     note = timed("Handoff note", generate_handoff_note, state, target)
+    print_route()
     state.handoff_notes.append(note)
 
     print(f"  ✅ Handoff note created:")
@@ -54,20 +62,21 @@ def handle_transfer(state: ConversationState, target: str) -> str:
     )
 
     greeting = timed("Greeting LLM", respond, state)
+    print_route()
     state.add_message("assistant", greeting)
     return greeting
 
 
 def print_session_summary(state: ConversationState) -> None:
     """Print a summary of the conversation when the user exits."""
-    user_msgs = [m for m in state.history if m["role"] == "user"]
-    if not user_msgs:
+    user_turns = state.count("user")
+    if not user_turns:
         return
 
     print("\n" + "=" * 55)
     print("  📊  Session Summary")
     print("=" * 55)
-    print(f"  Turns: {len(user_msgs)}")
+    print(f"  Turns: {user_turns}")
     print(f"  Transfers: {len(state.handoff_notes)}")
 
     if state.handoff_notes:
@@ -76,32 +85,28 @@ def print_session_summary(state: ConversationState) -> None:
             summary = note.summary[:80].rsplit(" ", 1)[0] + "..." if len(note.summary) > 80 else note.summary
             print(f"    {note.from_agent} → {note.to_agent}: {summary}")
 
-    # Generate a quick wrap-up from the LLM
-    from openai import OpenAI
-    from config import settings
+    if router.stats:
+        print("  Model latency (EWMA):")
+        for model, stats in router.stats.items():
+            fallbacks = router.outcomes[model, "fallback"]
+            print(
+                f"    {model}: TTFT {int(stats.ttft_ms)}ms, "
+                f"{stats.tokens_per_s:.0f} tok/s, {stats.calls} calls ({fallbacks} fallback)"
+            )
 
+    # Generate a quick wrap-up from the LLM
     conv_text = "\n".join(
         f"{m['role'].upper()}: {m['content']}"
-        for m in state.history[-20:]
+        for m in state.messages(last=20)
         if m["role"] in ("user", "assistant")
     )
 
     try:
-        client = OpenAI(
-            api_key=settings.openrouter_api_key,
-            base_url=settings.openrouter_base_url,
-        )
-        resp = client.chat.completions.create(
-            model=settings.llm_model,
-            messages=[{
-                "role": "user",
-                "content": f"Summarize this home renovation conversation in 2-3 bullet points. "
-                f"Focus on decisions made and next steps:\n{conv_text}",
-            }],
-            max_tokens=200,
-            temperature=0.3,
-        )
-        summary = resp.choices[0].message.content.strip()
+        summary = router.complete("summary", [{
+            "role": "user",
+            "content": f"Summarize this home renovation conversation in 2-3 bullet points. "
+            f"Focus on decisions made and next steps:\n{conv_text}",
+        }])
         # Indent each line of the summary consistently
         lines = summary.split("\n")
         print("\n  Key takeaways:")
@@ -182,6 +187,7 @@ def main():
         # Normal conversation
         state.add_message("user", text)
         response = timed("LLM", respond, state)
+        print_route()
         state.add_message("assistant", response)
 
         # Check if agent suggests transfer
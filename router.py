@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+
+from openai import OpenAI
+
+from config import settings
+
+# Generation budget per call type, optionally narrowed per agent ("respond:Bob").
+# slo_ms is the end-to-end budget for the call; 0 means background work that
+# never falls back (nobody is waiting on the session summary).
+ROUTES = {
+    "respond": {"max_tokens": 300, "temperature": 0.7, "slo_ms": 3000},
+    "respond:Bob": {"max_tokens": 150, "temperature": 0.7, "slo_ms": 2000},
+    "respond:Alice": {"max_tokens": 300, "temperature": 0.7, "slo_ms": 3500},
+    "handoff": {"max_tokens": 300, "temperature": 0.3, "slo_ms": 4000},
+    "summary": {"max_tokens": 200, "temperature": 0.3, "slo_ms": 0},
+}
+
+EWMA_ALPHA = 0.3
+# After this many fallbacks, send one call to the slow model anyway so its
+# EWMA can recover once the provider speeds back up.
+PROBE_EVERY = 10
+
+
+def _ewma(current: float, sample: float) -> float:
+    return sample if not current else current + EWMA_ALPHA * (sample - current)
+
+
+@dataclass
+class ModelStats:
+    """EWMA of time-to-first-token and decode throughput for one model."""
+
+    ttft_ms: float = 0.0
+    tokens_per_s: float = 0.0
+    calls: int = 0
+
+    def observe(self, ttft_ms: float, tokens_per_s: float | None) -> None:
+        self.ttft_ms = ttft_ms if not self.calls else _ewma(self.ttft_ms, ttft_ms)
+        if tokens_per_s:
+            self.tokens_per_s = _ewma(self.tokens_per_s, tokens_per_s)
+        self.calls += 1
+
+    def predict_ms(self, tokens: float) -> float:
+        """Expected latency for a completion of `tokens` tokens."""
+        decode_ms = tokens / self.tokens_per_s * 1000 if self.tokens_per_s else 0.0
+        return self.ttft_ms + decode_ms
+
+
+@dataclass
+class RouteDecision:
+    call: str
+    agent: str
+    model: str
+    reason: str  # "primary", "fallback", "probe"
+    predicted_ms: float = 0.0  # for the routed (primary) model -why it was or wasn't used
+    slo_ms: int = 0
+    ttft_ms: float = 0.0
+    total_ms: float = 0.0
+
+    def format(self) -> str:
+        target = f"{self.call}/{self.agent}" if self.agent else self.call
+        line = f"{target} → {self.model} ({self.reason}"
+        if self.slo_ms:
+            line += f", predicted {int(self.predicted_ms)}ms vs SLO {self.slo_ms}ms"
+        line += f"), TTFT {int(self.ttft_ms)}ms, total {int(self.total_ms)}ms"
+        return line
+
+
+@dataclass
+class Router:
+    """Picks a model per call type/agent and falls back to settings.llm_fast_model
+    when the routed model's observed latency would miss the route's SLO."""
+
+    stats: dict[str, ModelStats] = field(default_factory=dict)
+    # EWMA of completion tokens per ("call:agent", model) -Bob's clarifying
+    # questions are far shorter than the route's max_tokens ceiling
+    lengths: dict[tuple[str, str], float] = field(default_factory=dict)
+    # The router is a process-wide singleton, so keep only the latest decision
+    # and running (model, reason) counts rather than a per-call history
+    last: RouteDecision | None = None
+    outcomes: Counter[tuple[str, str]] = field(default_factory=Counter)
+    _skipped: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    _client: OpenAI | None = None
+
+    def _get_client(self) -> OpenAI:
+        if self._client is None:
+            self._client = OpenAI(
+                api_key=settings.openrouter_api_key,
+                base_url=settings.openrouter_base_url,
+            )
+        return self._client
+
+    def predict_ms(self, key: str, model: str) -> float:
+        """Unobserved models and routes predict 0 so they get tried at least once."""
+        stats = self.stats.get(model)
+        tokens = self.lengths.get((key, model))
+        if stats is None or tokens is None:
+            return 0.0
+        return stats.predict_ms(tokens)
+
+    def route(self, call: str, agent: str = "") -> tuple[RouteDecision, dict]:
+        key = f"{call}:{agent}"
+        spec = ROUTES.get(key) or ROUTES[call]
+        primary = settings.llm_routes.get(key) or settings.llm_routes.get(call) or settings.llm_model
+        fast = settings.llm_fast_model
+        slo = spec["slo_ms"]
+
+        decision = RouteDecision(call=call, agent=agent, model=primary, reason="primary", slo_ms=slo)
+        decision.predicted_ms = self.predict_ms(key, primary)
+        if not slo or not fast or fast == primary or decision.predicted_ms <= slo:
+            return decision, spec
+
+        self._skipped[primary] += 1
+        if self._skipped[primary] % PROBE_EVERY == 0:
+            decision.reason = "probe"
+            return decision, spec
+
+        decision.model = fast
+        decision.reason = "fallback"
+        return decision, spec
+
+    def complete(self, call: str, messages: list[dict[str, str]], agent: str = "") -> str:
+        """Run a chat completion on the routed model. Streams so TTFT and
+        throughput can be measured, then returns the full text."""
+        decision, spec = self.route(call, agent)
+
+        t0 = time.perf_counter()
+        first = None
+        chunks: list[str] = []
+        usage = None
+        stream = self._get_client().chat.completions.create(
+            model=decision.model,
+            messages=messages,
+            max_tokens=spec["max_tokens"],
+            temperature=spec["temperature"],
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        for chunk in stream:
+            if chunk.usage:
+                usage = chunk.usage
+            if not chunk.choices or not chunk.choices[0].delta.content:
+                continue
+            if first is None:
+                first = time.perf_counter()
+            chunks.append(chunk.choices[0].delta.content)
+        end = time.perf_counter()
+
+        # Providers often batch several tokens per chunk, so prefer the reported
+        # usage and only count chunks when the stream doesn't include it
+        tokens = usage.completion_tokens if usage and usage.completion_tokens else len(chunks)
+        first = first or end
+        decision.ttft_ms = (first - t0) * 1000
+        decision.total_ms = (end - t0) * 1000
+        decode_s = end - first
+        tokens_per_s = tokens / decode_s if len(chunks) > 1 and decode_s > 0 else None
+        self.stats.setdefault(decision.model, ModelStats()).observe(decision.ttft_ms, tokens_per_s)
+        length_key = (f"{call}:{agent}", decision.model)
+        self.lengths[length_key] = _ewma(self.lengths.get(length_key, 0.0), tokens)
+        self.last = decision
+        self.outcomes[decision.model, decision.reason] += 1
+
+        return "".join(chunks).strip()
+
+
+router = Router()
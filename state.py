@@ -1,18 +1,56 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import base64
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+import zlib
+from array import array
+from dataclasses import asdict, dataclass, field
+from enum import IntEnum
 
+from config import settings
 
-@dataclass
+
+class Role(IntEnum):
+    SYSTEM = 0
+    USER = 1
+    ASSISTANT = 2
+
+
+# Interned so every materialised message dict shares the same role strings
+ROLE_NAMES = tuple(sys.intern(r.name.lower()) for r in Role)
+_ROLE_IDS = {name: Role(i) for i, name in enumerate(ROLE_NAMES)}
+
+_SESSION_ID = re.compile(r"[A-Za-z0-9_-]{1,128}")
+
+
+def _b64(raw: bytes) -> str:
+    return base64.b64encode(raw).decode("ascii")
+
+
+@dataclass(slots=True)
 class HandoffNote:
     """LLM-distilled handoff -summary sheet, not a raw transcript dump."""
 
     from_agent: str
     to_agent: str
     summary: str
-    key_facts: list[str] = field(default_factory=list)
-    open_questions: list[str] = field(default_factory=list)
-    recommendations: list[str] = field(default_factory=list)
+    key_facts: tuple[str, ...] = ()
+    open_questions: tuple[str, ...] = ()
+    recommendations: tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        # Notes are never edited after creation; tuples skip list over-allocation.
+        # The LLM may return null for an empty list.
+        self.from_agent = sys.intern(self.from_agent)
+        self.to_agent = sys.intern(self.to_agent)
+        self.key_facts = tuple(self.key_facts or ())
+        self.open_questions = tuple(self.open_questions or ())
+        self.recommendations = tuple(self.recommendations or ())
 
     def format(self) -> str:
         lines = [
@@ -31,19 +69,175 @@ class HandoffNote:
         return "\n".join(lines)
 
 
-@dataclass
+@dataclass(slots=True)
 class ConversationState:
     # handoff_notes is append-only: after Bob->Alice->Bob, Bob sees BOTH notes.
     # prevents the "telephone game" problem where context degrades with each transfer.
+    #
+    # Messages are packed rather than kept as dicts: one role byte and one end
+    # offset per message, with all content in a single UTF-8 buffer. ~5 bytes of
+    # overhead per message instead of a dict + two str objects (~300 bytes).
+    # The buffer can be zlib-compressed while the session is idle; any read or
+    # append transparently decompresses it.
 
     active_agent: str = "Bob"
-    history: list[dict[str, str]] = field(default_factory=list)
     handoff_notes: list[HandoffNote] = field(default_factory=list)
+    _roles: array = field(default_factory=lambda: array("B"), init=False, repr=False)
+    _ends: array = field(default_factory=lambda: array("I"), init=False, repr=False)
+    _text: bytearray = field(default_factory=bytearray, init=False, repr=False)
+    _packed: bytes | None = field(default=None, init=False, repr=False)
+    last_used: float = field(default_factory=time.monotonic, init=False, repr=False)
+    spilled: bool = field(default=False, init=False, repr=False)
 
     def add_message(self, role: str, content: str) -> None:
-        self.history.append({"role": role, "content": content})
+        if self.spilled:
+            raise RuntimeError("session was spilled to disk; fetch it again from the SessionStore")
+        self._warm()
+        self._text += content.encode("utf-8")
+        self._roles.append(_ROLE_IDS[role])
+        self._ends.append(len(self._text))
+
+    def messages(self, last: int | None = None) -> list[dict[str, str]]:
+        """OpenAI-format message list, built on demand (optionally only the last N)."""
+        self._warm()
+        n = len(self._roles)
+        start = max(0, n - last) if last is not None else 0
+        text = self._text
+        out = []
+        for i in range(start, n):
+            begin = self._ends[i - 1] if i else 0
+            out.append({
+                "role": ROLE_NAMES[self._roles[i]],
+                "content": text[begin:self._ends[i]].decode("utf-8"),
+            })
+        return out
+
+    def count(self, role: str) -> int:
+        return self._roles.count(_ROLE_IDS[role])
+
+    @property
+    def message_count(self) -> int:
+        return len(self._roles)
+
+    @property
+    def is_compressed(self) -> bool:
+        return self._packed is not None
+
+    def compress(self) -> None:
+        if self._packed is None and self._text:
+            self._packed = zlib.compress(self._text)
+            self._text = bytearray()
+
+    def _warm(self) -> None:
+        self.last_used = time.monotonic()
+        if self._packed is not None:
+            self._text = bytearray(zlib.decompress(self._packed))
+            self._packed = None
 
     def handoff_context(self) -> str:
         if not self.handoff_notes:
             return ""
         return "\n\n".join(note.format() for note in self.handoff_notes)
+
+    def to_json(self) -> str:
+        """Serialise the packed state (compressed) as plain JSON -nothing in it
+        executes when loaded, unlike a pickle."""
+        self.compress()
+        # roles are single bytes; ends go out as plain ints so the file doesn't
+        # depend on the native item size or byte order of array("I")
+        return json.dumps({
+            "active_agent": self.active_agent,
+            "roles": _b64(self._roles.tobytes()),
+            "ends": self._ends.tolist(),
+            "text": _b64(self._packed or b""),
+            "handoff_notes": [asdict(note) for note in self.handoff_notes],
+        })
+
+    @classmethod
+    def from_json(cls, raw: str) -> ConversationState:
+        data = json.loads(raw)
+        state = cls(
+            active_agent=data["active_agent"],
+            handoff_notes=[HandoffNote(**note) for note in data["handoff_notes"]],
+        )
+        state._roles.frombytes(base64.b64decode(data["roles"]))
+        state._ends.extend(data["ends"])
+        packed = base64.b64decode(data["text"])
+        # Loaded sessions are about to be used, so keep the text decompressed
+        state._text = bytearray(zlib.decompress(packed)) if packed else bytearray()
+        if len(state._roles) != len(state._ends):
+            raise ValueError("corrupt session: role and offset counts differ")
+        if max(state._roles, default=0) >= len(Role):
+            raise ValueError("corrupt session: unknown role")
+        if (state._ends[-1] if state._ends else 0) != len(state._text):
+            raise ValueError("corrupt session: last offset doesn't match text length")
+        return state
+
+
+class SessionStore:
+    """Holds many ConversationStates by session id. sweep() compresses sessions
+    idle past settings.session_compress_after and writes them to
+    settings.session_spill_dir past settings.session_spill_after; get() brings
+    a spilled session back into memory.
+
+    Idle time is measured from the state's last read or append, so holding a
+    reference while the session is in use is fine. A state spilled while held
+    refuses further appends -call get() again after any long pause."""
+
+    def __init__(self, spill_dir: str | None = None) -> None:
+        self.spill_dir = spill_dir or settings.session_spill_dir
+        self._sessions: dict[str, ConversationState] = {}
+
+    def _path(self, session_id: str) -> str:
+        # Ids end up in a file path, so keep them to a safe character set
+        if not _SESSION_ID.fullmatch(session_id):
+            raise ValueError(f"invalid session id: {session_id!r}")
+        return os.path.join(self.spill_dir, f"{session_id}.json")
+
+    def get(self, session_id: str) -> ConversationState:
+        path = self._path(session_id)
+        state = self._sessions.get(session_id)
+        if state is None:
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    state = ConversationState.from_json(f.read())
+                os.remove(path)
+            else:
+                state = ConversationState()
+            self._sessions[session_id] = state
+        state.last_used = time.monotonic()
+        return state
+
+    def sweep(self, now: float | None = None) -> None:
+        now = time.monotonic() if now is None else now
+        for session_id, state in list(self._sessions.items()):
+            idle = now - state.last_used
+            if idle >= settings.session_spill_after:
+                self._spill(session_id)
+            elif idle >= settings.session_compress_after:
+                state.compress()
+
+    def _spill(self, session_id: str) -> None:
+        # Write to a temp file and rename into place, so a failed write leaves
+        # the session in memory and no truncated file behind
+        path = self._path(session_id)
+        state = self._sessions[session_id]
+        os.makedirs(self.spill_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.spill_dir, prefix=f".{session_id}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(state.to_json())
+            os.replace(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+        del self._sessions[session_id]
+        state.spilled = True
+
+    def __contains__(self, session_id: str) -> bool:
+        if not _SESSION_ID.fullmatch(session_id):
+            return False
+        return session_id in self._sessions or os.path.exists(self._path(session_id))
+
+    def __len__(self) -> int:
+        return len(self._sessions)
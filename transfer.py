@@ -2,9 +2,7 @@ import json
 import re
 from dataclasses import dataclass
 
-from openai import OpenAI
-
-from config import settings
+from router import router
 from state import ConversationState, HandoffNote
 
 AGENT_NAMES = {"bob", "alice"}
@@ -98,21 +96,11 @@ def detect_agent_suggestion(response_text: str, current_agent: str) -> TransferR
     return TransferResult(should_transfer=False)
 
 
-_handoff_client = None
-
-
 def generate_handoff_note(state: ConversationState, target: str) -> HandoffNote:
     """Use LLM to generate a structured handoff note from conversation history."""
-    global _handoff_client
-    if _handoff_client is None:
-        _handoff_client = OpenAI(
-            api_key=settings.openrouter_api_key,
-            base_url=settings.openrouter_base_url,
-        )
-
     # Build conversation summary for the LLM
     conv_text = "\n".join(
-        f"{m['role'].upper()}: {m['content']}" for m in state.history[-20:]
+        f"{m['role'].upper()}: {m['content']}" for m in state.messages(last=20)
     )
 
     prompt = f"""Analyze this conversation between the user and {state.active_agent}, and create a handoff summary for {target}.
@@ -128,14 +116,7 @@ Return ONLY valid JSON with these fields:
 Conversation:
 {conv_text}"""
 
-    resp = _handoff_client.chat.completions.create(
-        model=settings.llm_model,
-        messages=[{"role": "user", "content": prompt}],
-        max_tokens=300,
-        temperature=0.3,
-    )
-
-    raw = resp.choices[0].message.content.strip()
+    raw = router.complete("handoff", [{"role": "user", "content": prompt}])
     parsed = _extract_json(raw)
 
     return HandoffNote(